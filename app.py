@@ -1,6 +1,5 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import yaml
@@ -10,7 +9,8 @@ from pathlib import Path
 from modules.data_loader import load_data, validate_excel
 from modules.kpi_calculator import calculate_kpis, calculate_boutique_metrics
 from modules.alerts import check_alerts, send_alert_summary
-from modules.visualizations import create_revenue_chart, create_inventory_chart, create_conversion_funnel
+from modules.visualizations import (create_revenue_chart, create_boutique_chart, create_inventory_chart,
+                                    create_conversion_funnel)
 
 # Page configuration
 st.set_page_config(
@@ -195,14 +195,8 @@ if data_source == "Demo Data" or 'sales_data' in st.session_state:
 
     with col2:
         st.subheader("🏪 Top 5 Boutiques by Revenue")
-        boutique_metrics = calculate_boutique_metrics(sales_data)
-        boutique_chart = px.bar(
-            boutique_metrics.head(5),
-            x='Boutique_Name',
-            y='Revenue',
-            color='Revenue',
-            color_continuous_scale='Blues'
-        )
+        boutique_metrics, top_boutiques = calculate_boutique_metrics(sales_data)
+        boutique_chart = create_boutique_chart(top_boutiques)
         st.plotly_chart(boutique_chart, use_container_width=True)
 
     # Charts Row 2
@@ -251,10 +245,19 @@ if data_source == "Demo Data" or 'sales_data' in st.session_state:
     with col1:
         if st.button("📥 Export to Excel", type="primary"):
             # Create Excel export
-            output_path = f"data/processed/dashboard_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+            output_dir = Path("data/processed")
+            output_dir.mkdir(parents=True, exist_ok=True)
+            output_path = output_dir / f"dashboard_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+            with pd.ExcelWriter(output_path, engine='xlsxwriter', datetime_format='yyyy-mm-dd') as writer:
                 boutique_metrics.to_excel(writer, sheet_name='Boutique_Performance', index=False)
                 pd.DataFrame([kpis]).to_excel(writer, sheet_name='KPIs', index=False)
+
+                # Currency format for revenue and a frozen header row
+                currency_format = writer.book.add_format({'num_format': '$#,##0'})
+                metrics_sheet = writer.sheets['Boutique_Performance']
+                revenue_col = boutique_metrics.columns.get_loc('Revenue')
+                metrics_sheet.set_column(revenue_col, revenue_col, 14, currency_format)
+                metrics_sheet.freeze_panes(1, 0)
             st.success(f"✓ Exported to {output_path}")
 
     with col2:
@@ -1,5 +1,7 @@
 import pandas as pd
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
+from modules.kpi_calculator import calculate_daily_summary, inventory_stats, unit_costs
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -25,17 +27,21 @@ def check_alerts(sales_data, inventory_data, thresholds):
     # Merge with provided thresholds
     thresholds = {**default_thresholds, **thresholds}
 
+    now = pd.Timestamp.now()
+
+    # Truncate dates to the day once and filter with masks, skipping blank dates
+    dates = sales_data['Date'].values.astype('datetime64[D]')
+    valid_dates = dates[~np.isnat(dates)]
+
     # Get today's and last week's data
-    today = datetime.now().date()
-    if len(sales_data) > 0:
-        latest_date = sales_data['Date'].max().date()
-        today_data = sales_data[sales_data['Date'].dt.date == latest_date]
-        week_ago = latest_date - timedelta(days=7)
-        week_ago_data = sales_data[sales_data['Date'].dt.date == week_ago]
+    if len(valid_dates) > 0:
+        latest_date = valid_dates.max()
+        today_data = sales_data[dates == latest_date]
 
         # Revenue Drop Alert
-        today_revenue = today_data['Revenue_USD'].sum()
-        week_ago_revenue = week_ago_data['Revenue_USD'].sum()
+        daily_revenue = calculate_daily_summary(sales_data)['revenue']
+        today_revenue = daily_revenue.get(pd.Timestamp(latest_date), 0)
+        week_ago_revenue = daily_revenue.get(pd.Timestamp(latest_date - 7), 0)
 
         if week_ago_revenue > 0:
             revenue_change = ((today_revenue - week_ago_revenue) / week_ago_revenue * 100)
@@ -45,7 +51,7 @@ def check_alerts(sales_data, inventory_data, thresholds):
                 )
 
         # Boutique Performance Alerts
-        boutique_revenue = today_data.groupby('Boutique_Name')['Revenue_USD'].sum()
+        boutique_revenue = today_data.groupby('Boutique_Name', observed=True)['Revenue_USD'].sum()
         avg_boutique_revenue = boutique_revenue.mean()
 
         for boutique, revenue in boutique_revenue.items():
@@ -55,11 +61,18 @@ def check_alerts(sales_data, inventory_data, thresholds):
                 )
 
         # Zero Transaction Alert (after 2 PM)
-        current_hour = datetime.now().hour
+        current_hour = now.hour
         if current_hour >= 14:
-            boutiques_with_sales = set(today_data['Boutique_Name'].unique())
-            all_boutiques = set(sales_data['Boutique_Name'].unique())
-            no_sales_boutiques = all_boutiques - boutiques_with_sales
+            if isinstance(sales_data['Boutique_Name'].dtype, pd.CategoricalDtype):
+                # Compare category codes rather than boutique name strings
+                all_codes = sales_data['Boutique_Name'].cat.codes.unique()
+                today_codes = today_data['Boutique_Name'].cat.codes.unique()
+                missing_codes = np.setdiff1d(all_codes[all_codes >= 0], today_codes, assume_unique=True)
+                no_sales_boutiques = sales_data['Boutique_Name'].cat.categories[missing_codes]
+            else:
+                boutiques_with_sales = set(today_data['Boutique_Name'].unique())
+                all_boutiques = set(sales_data['Boutique_Name'].unique())
+                no_sales_boutiques = all_boutiques - boutiques_with_sales
 
             for boutique in no_sales_boutiques:
                 alerts['critical'].append(
@@ -68,47 +81,41 @@ def check_alerts(sales_data, inventory_data, thresholds):
 
     # Inventory Alerts
     if len(inventory_data) > 0:
-        # Low Stock Alert
-        low_stock = inventory_data[
-            inventory_data['Current_Stock_Units'] <= inventory_data['Min_Stock_Threshold']
-        ]
+        has_restock_date = 'Last_Restock_Date' in inventory_data.columns
+        if has_restock_date:
+            days_since_restock = (now - inventory_data['Last_Restock_Date']).dt.days.to_numpy()
+        else:
+            days_since_restock = np.zeros(len(inventory_data))
+
+        low_stock_count, stockout_count, dead_stock_value, total_inventory_value, stockout_idx = inventory_stats(
+            inventory_data['Current_Stock_Units'].to_numpy(),
+            inventory_data['Min_Stock_Threshold'].to_numpy(),
+            unit_costs(inventory_data),
+            days_since_restock
+        )
 
-        if len(low_stock) > 0:
+        # Low Stock Alert
+        if low_stock_count > 0:
             alerts['warning'].append(
-                f"{len(low_stock)} SKUs below minimum stock threshold"
+                f"{low_stock_count} SKUs below minimum stock threshold"
             )
 
-        # Stockout Alert
-        stockout = inventory_data[inventory_data['Current_Stock_Units'] == 0]
-
-        if len(stockout) > 0:
-            for _, item in stockout.head(5).iterrows():  # Show top 5
+        # Stockout Alert (show first 5)
+        if stockout_count > 0:
+            stockout = inventory_data.iloc[stockout_idx[:min(stockout_count, 5)]]
+            for _, item in stockout.iterrows():
                 alerts['critical'].append(
                     f"STOCKOUT: {item['Product_Name']} at {item.get('Boutique_ID', 'Unknown')}"
                 )
 
         # Dead Stock Alert (over 180 days)
-        if 'Last_Restock_Date' in inventory_data.columns:
-            inventory_data['Days_Since_Restock'] = (
-                datetime.now() - pd.to_datetime(inventory_data['Last_Restock_Date'])
-            ).dt.days
-
-            dead_stock = inventory_data[
-                (inventory_data['Days_Since_Restock'] > 180) & 
-                (inventory_data['Current_Stock_Units'] > 0)
-            ]
-
-            if len(dead_stock) > 0:
-                dead_stock_value = (dead_stock['Current_Stock_Units'] * 
-                                   dead_stock['Unit_Cost']).sum()
-                total_inventory_value = (inventory_data['Current_Stock_Units'] * 
-                                        inventory_data['Unit_Cost']).sum()
-                dead_stock_pct = (dead_stock_value / total_inventory_value * 100) if total_inventory_value > 0 else 0
-
-                if dead_stock_pct > 10:
-                    alerts['warning'].append(
-                        f"Dead stock (>180 days) represents {dead_stock_pct:.1f}% of inventory value"
-                    )
+        if has_restock_date:
+            dead_stock_pct = (dead_stock_value / total_inventory_value * 100) if total_inventory_value > 0 else 0
+
+            if dead_stock_pct > 10:
+                alerts['warning'].append(
+                    f"Dead stock (>180 days) represents {dead_stock_pct:.1f}% of inventory value"
+                )
 
     return alerts
 
@@ -120,33 +127,26 @@ def send_alert_summary(alerts, email_settings):
         return
 
     try:
+        now = datetime.now()
+
         # Create email
         msg = MIMEMultipart()
         msg['From'] = email_settings.get('from_email', 'dashboard@company.com')
         msg['To'] = ', '.join(email_settings.get('to_emails', []))
-        msg['Subject'] = f"Luxury Retail Dashboard - Alert Summary {datetime.now().strftime('%Y-%m-%d')}"
+        msg['Subject'] = f"Luxury Retail Dashboard - Alert Summary {now.strftime('%Y-%m-%d')}"
 
         # Email body
-        body = f"""
-        <html>
-        <body>
-        <h2>Daily Alert Summary</h2>
-        <p>Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-
-        <h3 style="color: red;">Critical Alerts ({len(alerts['critical'])})</h3>
-        <ul>
-        {''.join([f'<li>{alert}</li>' for alert in alerts['critical']])}
-        </ul>
-
-        <h3 style="color: orange;">Warnings ({len(alerts['warning'])})</h3>
-        <ul>
-        {''.join([f'<li>{alert}</li>' for alert in alerts['warning']])}
-        </ul>
-
-        <p><a href="{email_settings.get('dashboard_url', '#')}">View Full Dashboard</a></p>
-        </body>
-        </html>
-        """
+        dashboard_url = email_settings.get('dashboard_url', '#')
+        parts = [
+            '<html>\n<body>\n<h2>Daily Alert Summary</h2>\n',
+            f"<p>Generated at: {now.strftime('%Y-%m-%d %H:%M:%S')}</p>\n",
+            f"<h3 style=\"color: red;\">Critical Alerts ({len(alerts['critical'])})</h3>\n<ul>\n"
+        ]
+        parts.extend(f'<li>{alert}</li>\n' for alert in alerts['critical'])
+        parts.append(f"</ul>\n<h3 style=\"color: orange;\">Warnings ({len(alerts['warning'])})</h3>\n<ul>\n")
+        parts.extend(f'<li>{alert}</li>\n' for alert in alerts['warning'])
+        parts.append(f'</ul>\n<p><a href="{dashboard_url}">View Full Dashboard</a></p>\n</body>\n</html>\n')
+        body = ''.join(parts)
 
         msg.attach(MIMEText(body, 'html'))
 
@@ -1,6 +1,34 @@
+import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = ['Boutique_ID', 'Boutique_Name', 'Region', 'Product_Category',
+                       'Category', 'Brand', 'Customer_Type', 'Payment_Method']
+
+def to_categorical(df):
+    """Convert repeated text columns to the category dtype"""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    return df
+
+# Small-range count columns downcast to the narrowest integer type, price columns to float32.
+# Revenue_USD is left as loaded since its totals are reported to the dollar.
+INTEGER_COLUMNS = ['Units_Sold', 'Current_Stock_Units', 'Min_Stock_Threshold',
+                   'Max_Stock_Threshold', 'Supplier_Lead_Time_Days']
+FLOAT_COLUMNS = ['Unit_Cost', 'Retail_Price']
+
+def downcast_numeric(df):
+    """Shrink numeric columns to the smallest dtype that holds their values"""
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast='float')
+    return df
 
 def validate_excel(df, required_columns, file_type):
     """Validate uploaded Excel file has required columns"""
@@ -12,6 +40,28 @@ def validate_excel(df, required_columns, file_type):
 
     return errors
 
+def read_table(file, columns):
+    """Read the listed columns of an uploaded CSV or Excel file, using compiled parsers when available"""
+    wanted = set(columns)
+
+    if file.name.endswith('.csv'):
+        # pyarrow only accepts a column list, so drop names missing from the header
+        # and leave it to validate_excel to report them
+        header = pd.read_csv(file, nrows=0).columns
+        usecols = [col for col in header if col in wanted]
+        file.seek(0)
+        try:
+            return pd.read_csv(file, engine='pyarrow', usecols=usecols)
+        except ImportError:
+            file.seek(0)
+            return pd.read_csv(file, usecols=usecols)
+
+    try:
+        return pd.read_excel(file, engine='calamine', usecols=lambda col: col in wanted)
+    except ImportError:
+        file.seek(0)
+        return pd.read_excel(file, usecols=lambda col: col in wanted)
+
 def load_data(sales_file, inventory_file):
     """Load and validate uploaded Excel files"""
     errors = []
@@ -25,18 +75,19 @@ def load_data(sales_file, inventory_file):
                         'Brand', 'Current_Stock_Units', 'Min_Stock_Threshold', 
                         'Retail_Price']
 
+    # Optional inventory columns used by the KPI and alert calculations
+    inventory_optional_columns = ['Unit_Cost', 'Last_Restock_Date']
+
     try:
         # Load sales data
-        if sales_file.name.endswith('.csv'):
-            sales_data = pd.read_csv(sales_file)
-        else:
-            sales_data = pd.read_excel(sales_file)
+        sales_data = read_table(sales_file, sales_columns)
 
         # Validate sales data
         errors.extend(validate_excel(sales_data, sales_columns, "Sales Report"))
 
         # Convert date column
         sales_data['Date'] = pd.to_datetime(sales_data['Date'])
+        sales_data = downcast_numeric(to_categorical(sales_data))
 
     except Exception as e:
         errors.append(f"Error loading sales file: {str(e)}")
@@ -44,16 +95,16 @@ def load_data(sales_file, inventory_file):
 
     try:
         # Load inventory data
-        if inventory_file.name.endswith('.csv'):
-            inventory_data = pd.read_csv(inventory_file)
-        else:
-            inventory_data = pd.read_excel(inventory_file)
+        inventory_data = read_table(inventory_file, inventory_columns + inventory_optional_columns)
 
         # Validate inventory data
         errors.extend(validate_excel(inventory_data, inventory_columns, "Inventory Report"))
 
-        # Convert date column
+        # Convert date columns
         inventory_data['Date'] = pd.to_datetime(inventory_data['Date'])
+        if 'Last_Restock_Date' in inventory_data.columns:
+            inventory_data['Last_Restock_Date'] = pd.to_datetime(inventory_data['Last_Restock_Date'])
+        inventory_data = downcast_numeric(to_categorical(inventory_data))
 
     except Exception as e:
         errors.append(f"Error loading inventory file: {str(e)}")
@@ -61,11 +112,12 @@ def load_data(sales_file, inventory_file):
 
     return sales_data, inventory_data, errors
 
+@st.cache_data(ttl=3600)
 def generate_demo_data():
     """Generate demo data for testing"""
 
     # Demo sales data
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     dates = pd.date_range(end=datetime.now(), periods=30, freq='D')
     boutiques = ['Dubai Mall', 'Paris Champs-Élysées', 'London Bond Street', 
                 'NYC Fifth Avenue', 'Tokyo Ginza', 'Hong Kong Central']
@@ -73,53 +125,61 @@ def generate_demo_data():
     categories = ['Watches', 'Jewelry', 'Accessories']
     brands = ['Rolex', 'Cartier', 'Patek Philippe', 'Van Cleef & Arpels']
 
-    sales_records = []
-    for date in dates:
-        for boutique, region in zip(boutiques, regions):
-            # Generate 5-15 transactions per boutique per day
-            num_transactions = np.random.randint(5, 16)
-            for i in range(num_transactions):
-                sales_records.append({
-                    'Date': date,
-                    'Boutique_ID': f"BTQ{boutiques.index(boutique)+1:03d}",
-                    'Boutique_Name': boutique,
-                    'Region': region,
-                    'SKU_Code': f"SKU{np.random.randint(1000, 9999)}",
-                    'Product_Category': np.random.choice(categories),
-                    'Brand': np.random.choice(brands),
-                    'Units_Sold': np.random.randint(1, 4),
-                    'Revenue_Local_Currency': np.random.randint(5000, 50000),
-                    'Revenue_USD': np.random.randint(5000, 50000),
-                    'Transaction_ID': f"TXN{date.strftime('%Y%m%d')}{i:04d}",
-                    'Sales_Associate_ID': f"SA{np.random.randint(100, 999)}",
-                    'Customer_Type': np.random.choice(['New', 'Returning', 'VIP'], p=[0.3, 0.5, 0.2]),
-                    'Payment_Method': np.random.choice(['Credit Card', 'Cash', 'Wire Transfer'])
-                })
-
-    sales_data = pd.DataFrame(sales_records)
-
-    # Demo inventory data
-    inventory_records = []
-    for boutique in boutiques:
-        for i in range(50):  # 50 SKUs per boutique
-            current_stock = np.random.randint(0, 20)
-            min_threshold = 5
-            inventory_records.append({
-                'Date': datetime.now(),
-                'Boutique_ID': f"BTQ{boutiques.index(boutique)+1:03d}",
-                'SKU_Code': f"SKU{1000+i}",
-                'Product_Name': f"Luxury Item {i}",
-                'Category': np.random.choice(categories),
-                'Brand': np.random.choice(brands),
-                'Current_Stock_Units': current_stock,
-                'Min_Stock_Threshold': min_threshold,
-                'Max_Stock_Threshold': 20,
-                'Unit_Cost': np.random.randint(2000, 20000),
-                'Retail_Price': np.random.randint(5000, 50000),
-                'Last_Restock_Date': datetime.now() - timedelta(days=np.random.randint(1, 60)),
-                'Supplier_Lead_Time_Days': np.random.randint(7, 30)
-            })
-
-    inventory_data = pd.DataFrame(inventory_records)
+    boutique_ids = [f"BTQ{i+1:03d}" for i in range(len(boutiques))]
+
+    # Generate 5-15 transactions per boutique per day, then expand each
+    # (date, boutique) slot to its transactions in one go
+    num_transactions = rng.integers(5, 16, size=len(dates) * len(boutiques))
+    n = num_transactions.sum()
+    slot_dates = np.repeat(dates.values, len(boutiques))
+    slot_boutiques = np.tile(np.arange(len(boutiques)), len(dates))
+    boutique_idx = np.repeat(slot_boutiques, num_transactions)
+    txn_dates = pd.DatetimeIndex(np.repeat(slot_dates, num_transactions))
+    # Position of each transaction within its boutique's day
+    txn_seq = np.arange(n) - np.repeat(np.cumsum(num_transactions) - num_transactions,
+                                       num_transactions)
+
+    sales_data = pd.DataFrame({
+        'Date': txn_dates,
+        'Boutique_ID': np.array(boutique_ids)[boutique_idx],
+        'Boutique_Name': np.array(boutiques)[boutique_idx],
+        'Region': np.array(regions)[boutique_idx],
+        'SKU_Code': np.char.mod('SKU%04d', rng.integers(1000, 9999, size=n)),
+        'Product_Category': rng.choice(categories, size=n),
+        'Brand': rng.choice(brands, size=n),
+        'Units_Sold': rng.integers(1, 4, size=n),
+        'Revenue_Local_Currency': rng.integers(5000, 50000, size=n),
+        'Revenue_USD': rng.integers(5000, 50000, size=n),
+        'Transaction_ID': np.char.add(txn_dates.strftime('TXN%Y%m%d').to_numpy(dtype=str),
+                                      np.char.zfill(txn_seq.astype(str), 4)),
+        'Sales_Associate_ID': np.char.mod('SA%03d', rng.integers(100, 999, size=n)),
+        'Customer_Type': rng.choice(['New', 'Returning', 'VIP'], size=n, p=[0.3, 0.5, 0.2]),
+        'Payment_Method': rng.choice(['Credit Card', 'Cash', 'Wire Transfer'], size=n)
+    })
+
+    # Demo inventory data (50 SKUs per boutique)
+    skus_per_boutique = 50
+    m = skus_per_boutique * len(boutiques)
+    sku_idx = np.tile(np.arange(skus_per_boutique), len(boutiques))
+    now = datetime.now()
+
+    inventory_data = pd.DataFrame({
+        'Date': now,
+        'Boutique_ID': np.repeat(boutique_ids, skus_per_boutique),
+        'SKU_Code': np.char.add('SKU', (1000 + sku_idx).astype(str)),
+        'Product_Name': np.char.add('Luxury Item ', sku_idx.astype(str)),
+        'Category': rng.choice(categories, size=m),
+        'Brand': rng.choice(brands, size=m),
+        'Current_Stock_Units': rng.integers(0, 20, size=m),
+        'Min_Stock_Threshold': 5,
+        'Max_Stock_Threshold': 20,
+        'Unit_Cost': rng.integers(2000, 20000, size=m),
+        'Retail_Price': rng.integers(5000, 50000, size=m),
+        'Last_Restock_Date': now - pd.to_timedelta(rng.integers(1, 60, size=m), unit='D'),
+        'Supplier_Lead_Time_Days': rng.integers(7, 30, size=m)
+    })
+
+    sales_data = downcast_numeric(to_categorical(sales_data))
+    inventory_data = downcast_numeric(to_categorical(inventory_data))
 
     return sales_data, inventory_data
@@ -1,69 +1,112 @@
+import streamlit as st
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from numba import njit
+from datetime import timedelta
 
+def unit_costs(inventory_data):
+    """Unit cost per SKU, estimated as 40% of retail price if Unit_Cost not available"""
+    if 'Unit_Cost' in inventory_data.columns:
+        return inventory_data['Unit_Cost'].to_numpy()
+    return inventory_data['Retail_Price'].to_numpy() * 0.4
+
+@njit(cache=True)
+def inventory_stats(stock, min_thresh, unit_cost, days):
+    """Scan inventory once for stock counts, stock value and stockout rows"""
+    low = 0
+    out = 0
+    dead_value = 0.0
+    total_value = 0.0
+    stockout_idx = np.full(5, -1, np.int64)
+    for i in range(stock.shape[0]):
+        s = stock[i]
+        v = s * unit_cost[i]
+        if v == v:  # skip blank stock or cost
+            total_value += v
+        if s <= min_thresh[i]:
+            low += 1
+        if s == 0:
+            if out < 5:
+                stockout_idx[out] = i
+            out += 1
+        if days[i] > 180 and s > 0 and v == v:
+            dead_value += v
+    return low, out, dead_value, total_value, stockout_idx
+
+@st.cache_data(ttl=3600)
+def calculate_daily_summary(sales_data):
+    """Summarize revenue, transactions and active boutiques per day"""
+
+    # Single pass over the sales rows, then work on the small per-transaction table.
+    # Blank IDs are kept as their own group so their revenue still counts.
+    per_txn = sales_data.groupby(
+        [sales_data['Date'].dt.floor('D'), 'Transaction_ID', 'Boutique_ID'], observed=True, dropna=False
+    )['Revenue_USD'].sum().reset_index()
+
+    txn_revenue = per_txn.groupby(['Date', 'Transaction_ID'], dropna=False)['Revenue_USD'].sum()
+    daily = txn_revenue.groupby(level='Date').agg(revenue='sum', transactions='size')
+
+    # ATV only averages over rows with a Transaction_ID
+    has_txn_id = txn_revenue.index.get_level_values('Transaction_ID').notna()
+    daily['atv'] = txn_revenue[has_txn_id].groupby(level='Date').mean()
+    daily['boutiques'] = per_txn.groupby('Date')['Boutique_ID'].nunique(dropna=False)
+
+    return daily
+
+@st.cache_data(ttl=3600)
 def calculate_kpis(sales_data, inventory_data):
     """Calculate key performance indicators"""
 
-    # Today's data
-    today = datetime.now().date()
-    today_data = sales_data[sales_data['Date'].dt.date == today]
-    yesterday_data = sales_data[sales_data['Date'].dt.date == (today - timedelta(days=1))]
+    now = pd.Timestamp.now()
+    daily = calculate_daily_summary(sales_data)
 
-    # If no data for today, use latest available date
-    if len(today_data) == 0:
-        latest_date = sales_data['Date'].max()
-        today_data = sales_data[sales_data['Date'].dt.date == latest_date.date()]
-        prev_date = latest_date - timedelta(days=1)
-        yesterday_data = sales_data[sales_data['Date'].dt.date == prev_date.date()]
+    # Today's data, or the latest available date if there are no sales today
+    today = now.normalize()
+    current_date = today if today in daily.index else daily.index.max()
+    summary = daily.reindex([current_date, current_date - timedelta(days=1)])
+    totals = ['revenue', 'transactions', 'boutiques']
+    summary[totals] = summary[totals].fillna(0)
+    today_stats = summary.iloc[0]
+    yesterday_stats = summary.iloc[1]
 
     # Daily Revenue
-    daily_revenue = today_data['Revenue_USD'].sum()
-    prev_revenue = yesterday_data['Revenue_USD'].sum()
+    daily_revenue = today_stats['revenue']
+    prev_revenue = yesterday_stats['revenue']
     revenue_growth = ((daily_revenue - prev_revenue) / prev_revenue * 100) if prev_revenue > 0 else 0
 
     # Average Transaction Value
-    atv = today_data.groupby('Transaction_ID')['Revenue_USD'].sum().mean()
-    prev_atv = yesterday_data.groupby('Transaction_ID')['Revenue_USD'].sum().mean()
+    atv = today_stats['atv']
+    prev_atv = yesterday_stats['atv']
     atv_change = ((atv - prev_atv) / prev_atv * 100) if prev_atv > 0 else 0
 
     # Conversion Rate (assuming 100 visitors per boutique per day as baseline)
-    total_transactions = len(today_data['Transaction_ID'].unique())
-    total_boutiques = len(today_data['Boutique_ID'].unique())
-    estimated_visitors = total_boutiques * 100
+    total_transactions = today_stats['transactions']
+    estimated_visitors = today_stats['boutiques'] * 100
     conversion_rate = (total_transactions / estimated_visitors * 100) if estimated_visitors > 0 else 0
 
-    prev_transactions = len(yesterday_data['Transaction_ID'].unique())
-    prev_visitors = len(yesterday_data['Boutique_ID'].unique()) * 100
+    prev_transactions = yesterday_stats['transactions']
+    prev_visitors = yesterday_stats['boutiques'] * 100
     prev_conversion = (prev_transactions / prev_visitors * 100) if prev_visitors > 0 else 0
     conversion_change = conversion_rate - prev_conversion
 
     # Inventory Turnover (annual basis)
-    # Use Retail_Price as proxy for cost if Unit_Cost not available
-    if 'Unit_Cost' in inventory_data.columns:
-        unit_cost = inventory_data['Unit_Cost']
-    else:
-        # Estimate cost as 40% of retail price if Unit_Cost not available
-        unit_cost = inventory_data['Retail_Price'] * 0.4
-
-    total_inventory_value = (inventory_data['Current_Stock_Units'] * unit_cost).sum()
+    unit_cost = unit_costs(inventory_data)
+    low_stock_items, stockout_risk, _, total_inventory_value, _ = inventory_stats(
+        inventory_data['Current_Stock_Units'].to_numpy(),
+        inventory_data['Min_Stock_Threshold'].to_numpy(),
+        unit_cost,
+        np.zeros(len(inventory_data))
+    )
 
     # Calculate COGS from sales data
-    last_30_days = sales_data[sales_data['Date'] >= (datetime.now() - timedelta(days=30))]
+    last_30_days = sales_data[sales_data['Date'] >= (now - timedelta(days=30))]
 
     # Estimate average unit cost from inventory
-    avg_unit_cost = unit_cost.mean()
+    avg_unit_cost = np.nanmean(unit_cost) if len(unit_cost) > 0 else np.nan
     cogs_30_days = last_30_days['Units_Sold'].sum() * avg_unit_cost
     annual_cogs = cogs_30_days * 12
     inventory_turnover = (annual_cogs / total_inventory_value) if total_inventory_value > 0 else 0
 
-    # Low Stock Items
-    low_stock_items = len(inventory_data[
-        inventory_data['Current_Stock_Units'] <= inventory_data['Min_Stock_Threshold']
-    ])
-
-    stockout_risk = len(inventory_data[inventory_data['Current_Stock_Units'] == 0])
-
     return {
         'daily_revenue': daily_revenue,
         'revenue_growth': revenue_growth,
@@ -76,20 +119,19 @@ def calculate_kpis(sales_data, inventory_data):
         'stockout_risk': stockout_risk
     }
 
+@st.cache_data(ttl=3600)
 def calculate_boutique_metrics(sales_data):
-    """Calculate performance metrics by boutique"""
+    """Calculate performance metrics by boutique and the top 5 by revenue"""
 
     # Latest 7 days
     latest_date = sales_data['Date'].max()
     last_7_days = sales_data[sales_data['Date'] >= (latest_date - timedelta(days=7))]
 
-    boutique_metrics = last_7_days.groupby(['Boutique_Name', 'Region']).agg({
-        'Revenue_USD': 'sum',
-        'Units_Sold': 'sum',
-        'Transaction_ID': 'nunique'
-    }).reset_index()
-
-    boutique_metrics.columns = ['Boutique_Name', 'Region', 'Revenue', 'Units_Sold', 'Transactions']
+    boutique_metrics = last_7_days.groupby(['Boutique_Name', 'Region'], observed=True, as_index=False).agg(
+        Revenue=('Revenue_USD', 'sum'),
+        Units_Sold=('Units_Sold', 'sum'),
+        Transactions=('Transaction_ID', 'nunique')
+    )
 
     # Calculate conversion rate (estimated)
     boutique_metrics['Estimated_Visitors'] = 700  # 100 per day * 7 days
@@ -98,21 +140,21 @@ def calculate_boutique_metrics(sales_data):
 
     boutique_metrics['ATV'] = boutique_metrics['Revenue'] / boutique_metrics['Transactions']
 
-    # Sort by revenue
+    # Sort once by revenue; the chart takes the top 5 of the same order as the table
     boutique_metrics = boutique_metrics.sort_values('Revenue', ascending=False)
+    top_boutiques = boutique_metrics.head(5)
 
-    return boutique_metrics
+    return boutique_metrics, top_boutiques
 
+@st.cache_data(ttl=3600)
 def calculate_category_performance(sales_data):
     """Calculate performance by product category"""
 
-    category_metrics = sales_data.groupby('Product_Category').agg({
-        'Revenue_USD': 'sum',
-        'Units_Sold': 'sum',
-        'Transaction_ID': 'nunique'
-    }).reset_index()
-
-    category_metrics.columns = ['Category', 'Revenue', 'Units_Sold', 'Transactions']
+    category_metrics = sales_data.groupby('Product_Category', observed=True).agg(
+        Revenue=('Revenue_USD', 'sum'),
+        Units_Sold=('Units_Sold', 'sum'),
+        Transactions=('Transaction_ID', 'nunique')
+    ).rename_axis('Category').reset_index()
     category_metrics['Revenue_Share'] = (category_metrics['Revenue'] / 
                                          category_metrics['Revenue'].sum() * 100)
 
@@ -1,22 +1,41 @@
-import plotly.express as px
+import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 
+@st.cache_data(ttl=3600)
 def create_revenue_chart(sales_data):
     """Create 7-day revenue trend chart"""
-    daily_revenue = sales_data.groupby(sales_data['Date'].dt.date)['Revenue_USD'].sum().reset_index()
+    daily_revenue = sales_data.groupby(sales_data['Date'].dt.floor('D'))['Revenue_USD'].sum().reset_index()
     daily_revenue.columns = ['Date', 'Revenue']
 
-    fig = px.line(daily_revenue, x='Date', y='Revenue', 
-                  title='Daily Revenue Trend',
-                  markers=True)
-    fig.update_traces(line_color='#667eea', line_width=3)
-    fig.update_layout(hovermode='x unified')
+    fig = go.Figure(go.Scatter(
+        x=daily_revenue['Date'].to_numpy(),
+        y=daily_revenue['Revenue'].to_numpy(),
+        mode='lines+markers',
+        line=dict(color='#667eea', width=3)
+    ))
+    fig.update_layout(title='Daily Revenue Trend', xaxis_title='Date', yaxis_title='Revenue',
+                      hovermode='x unified')
+    return fig
+
+@st.cache_data(ttl=3600)
+def create_boutique_chart(top_boutiques):
+    """Create top boutiques by revenue bar chart"""
+    revenue = top_boutiques['Revenue'].to_numpy()
+
+    fig = go.Figure(go.Bar(
+        x=top_boutiques['Boutique_Name'].to_numpy(),
+        y=revenue,
+        marker=dict(color=revenue, colorscale='Blues', showscale=True,
+                    colorbar=dict(title='Revenue'))
+    ))
+    fig.update_layout(xaxis_title='Boutique_Name', yaxis_title='Revenue')
     return fig
 
+@st.cache_data(ttl=3600)
 def create_inventory_chart(inventory_data):
     """Create inventory status by category"""
-    category_stock = inventory_data.groupby('Category').agg({
+    category_stock = inventory_data.groupby('Category', observed=True).agg({
         'Current_Stock_Units': 'sum',
         'Min_Stock_Threshold': 'sum'
     }).reset_index()
@@ -30,6 +49,7 @@ def create_inventory_chart(inventory_data):
     fig.update_layout(barmode='group', title='Inventory Levels by Category')
     return fig
 
+@st.cache_data(ttl=3600)
 def create_conversion_funnel(sales_data):
     """Create conversion funnel visualization"""
     total_visitors = len(sales_data['Boutique_ID'].unique()) * 100
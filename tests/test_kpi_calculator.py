@@ -0,0 +1,31 @@
+import pandas as pd
+
+from modules.data_loader import to_categorical
+from modules.kpi_calculator import calculate_kpis
+
+
+def test_calculate_kpis_keeps_revenue_of_rows_with_blank_ids():
+    sales_data = to_categorical(pd.DataFrame({
+        'Date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-02', '2024-01-02', '2024-01-02']),
+        'Boutique_ID': ['BTQ001', 'BTQ001', 'BTQ001', 'BTQ002', None],
+        'Transaction_ID': ['TXN1', 'TXN2', 'TXN2', None, 'TXN3'],
+        'Units_Sold': [1, 1, 1, 1, 1],
+        'Revenue_USD': [80, 100, 50, 30, 20],
+    }))
+    inventory_data = pd.DataFrame({
+        'Current_Stock_Units': [0, 3, 10],
+        'Min_Stock_Threshold': [5, 5, 5],
+        'Unit_Cost': [100.0, 200.0, 300.0],
+        'Retail_Price': [250.0, 500.0, 750.0],
+    })
+
+    kpis = calculate_kpis(sales_data, inventory_data)
+
+    # Latest day is 2024-01-02: blank-ID rows still count toward revenue,
+    # but ATV only averages over transactions that have an ID
+    assert kpis['daily_revenue'] == 200
+    assert kpis['revenue_growth'] == 150.0
+    assert kpis['atv'] == 85.0
+    assert kpis['conversion_rate'] == 1.0
+    assert kpis['low_stock_items'] == 2
+    assert kpis['stockout_risk'] == 1